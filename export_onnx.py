@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Export the merged car-inspection model to ONNX for deployment.
+
+Eager transformers execution leaves kernel-fusion wins on the table for a
+fixed inference-only workload. This exports the LoRA-merged bf16 model so it
+can be served with onnxruntime-gpu (CUDA execution provider), e.g.:
+
+    from optimum.onnxruntime import ORTModelForVision2Seq
+    model = ORTModelForVision2Seq.from_pretrained("paligemma_car_inspection_onnx",
+                                                  provider="CUDAExecutionProvider")
+"""
+
+from optimum.exporters.onnx import main_export
+
+from inference import get_model
+
+MERGED_DIR = "paligemma_car_inspection_merged"
+OUTPUT_DIR = "paligemma_car_inspection_onnx"
+
+# Save the merged model + processor to disk; the exporter works from a directory
+model, processor = get_model()
+model.save_pretrained(MERGED_DIR)
+processor.save_pretrained(MERGED_DIR)
+
+# Export to ONNX
+main_export(MERGED_DIR, output=OUTPUT_DIR, task="image-text-to-text", dtype="bf16")
+
+print(f"ONNX model written to {OUTPUT_DIR}")
@@ -3,6 +3,7 @@ import websockets
 import json
 import pyaudio
 import base64
+from binascii import b2a_base64
 import logging
 import os
 import ssl
@@ -11,6 +12,19 @@ import threading
 from dotenv import load_dotenv
 load_dotenv()
 
+# orjson's C parser cuts per-event decode cost on delta-heavy streams; the
+# overlay already uses the same wrappers, and stdlib json remains the fallback
+try:
+    import orjson
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
 # Configure logging to be less verbose
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -190,7 +204,7 @@ class RealtimeClient:
         
         :param event: Event data to send (from the user)
         """
-        await self.ws.send(json.dumps(event))
+        await self.ws.send(json_dumps(event))
 
     async def receive_events(self):
         """
@@ -198,7 +212,7 @@ class RealtimeClient:
         """
         try:
             async for message in self.ws:
-                event = json.loads(message)
+                event = json_loads(message)
                 await self.handle_event(event)
         except websockets.ConnectionClosed as e:
             logger.error(f"WebSocket connection closed: {e}")
@@ -278,20 +292,40 @@ class RealtimeClient:
         """
         print("\nListening... (speak your message)")
         self.audio_handler.start_recording()
-        
+
+        # Capture runs on its own thread: stream.read() blocks for the chunk
+        # duration, and doing that on the event loop would stall WebSocket
+        # receive processing for ~20 ms per chunk. The thread paces itself at
+        # the device rate and hands chunks over via an asyncio.Queue.
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue(maxsize=64)
+
+        def capture():
+            try:
+                while True:
+                    data = self.audio_handler.record_chunk()
+                    if data is None:
+                        break
+                    loop.call_soon_threadsafe(chunks.put_nowait, data)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, None)
+
+        capture_thread = threading.Thread(target=capture, daemon=True)
+        capture_thread.start()
+
         try:
             while True:
-                chunk = self.audio_handler.record_chunk()
-                if chunk:
-                    # Encode and send audio chunk
-                    base64_chunk = base64.b64encode(chunk).decode('utf-8')
-                    await self.send_event({
-                        "type": "input_audio_buffer.append",
-                        "audio": base64_chunk
-                    })
-                    await asyncio.sleep(0.01)
-                else:
+                chunk = await chunks.get()
+                if chunk is None:
                     break
+                # Encode and send audio chunk
+                # b2a_base64 is the primitive under b64encode, without the
+                # wrapper overhead; ascii decode skips UTF-8 validation
+                base64_chunk = b2a_base64(chunk, newline=False).decode('ascii')
+                await self.send_event({
+                    "type": "input_audio_buffer.append",
+                    "audio": base64_chunk
+                })
 
         except Exception as e:
             logger.error(f"Error during audio recording: {e}")
@@ -299,6 +333,7 @@ class RealtimeClient:
         
         finally:
             self.audio_handler.stop_recording()
+            capture_thread.join(1.0)
             print("Processing...")
         
         # Commit the audio buffer if VAD is disabled
@@ -12,16 +12,64 @@ import sys
 import asyncio
 import threading
 import time
-import queue
-import base64
+import random
 import io
 import argparse
 import json
+from collections import deque
 import ssl
+import re
 import logging
 from dotenv import load_dotenv
 import os.path
 
+# Load environment variables from .env file
+dotenv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+if os.path.exists(dotenv_path):
+    load_dotenv(dotenv_path)
+else:
+    # Try loading from parent directory as fallback
+    parent_dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
+    if os.path.exists(parent_dotenv_path):
+        load_dotenv(parent_dotenv_path)
+    else:
+        load_dotenv()  # Try default locations
+
+# Fast config check: report the effective settings and exit before paying for
+# the AppKit/PyAudio/websockets imports (hundreds of ms and tens of MB RSS)
+if "--check-config" in sys.argv:
+    _key = os.getenv("OPENAI_API_KEY", "").strip()
+    print(f"OPENAI_API_KEY: {'set (' + _key[:7] + '...)' if _key else 'MISSING'}")
+    print(f"OPENAI_MODEL: {os.getenv('OPENAI_MODEL', 'gpt-4o-realtime-preview-2024-10-01')}")
+    print(f"OPENAI_BASE_URL: {os.getenv('OPENAI_BASE_URL', 'wss://api.openai.com/v1/realtime')}")
+    sys.exit(0)
+
+# Fastest available base64 encoder for the audio hot path: pybase64's SIMD
+# (AVX2/NEON) libbase64 when installed, otherwise binascii.b2a_base64 -- the
+# primitive underneath base64.b64encode, minus its wrapper overhead
+# (newline=False drops the trailing newline b2a_base64 appends by default)
+try:
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    from binascii import b2a_base64
+
+    def _b64encode(data):
+        return b2a_base64(data, newline=False)
+
+# orjson's C serializer/parser is several times faster than stdlib json on the
+# small-envelope-at-high-rate traffic of the Realtime API; fall back to stdlib.
+# The .decode() keeps frames as text -- the Realtime API speaks text JSON frames.
+try:
+    import orjson
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
 # Try to import websockets with proper error handling
 try:
     import websockets
@@ -30,6 +78,17 @@ except ImportError:
     print("Please install it using: pip install websockets>=11.0.0")
     sys.exit(1)
 
+# Prefer the new asyncio implementation (websockets >= 12): its frame parser
+# and masking routine are C-accelerated, so recv/send spend far less time
+# holding the GIL against the PortAudio capture callback thread
+try:
+    from websockets.asyncio.client import connect as ws_connect
+    _WS_RAW_RECV = True  # this implementation supports recv(decode=False)
+except ImportError:
+    ws_connect = websockets.connect  # legacy pure-Python implementation
+    _WS_RAW_RECV = False
+
+import numpy as np
 import pyaudio
 
 # PyObjC imports for macOS UI
@@ -38,18 +97,6 @@ import Foundation
 import PyObjCTools.AppHelper
 from objc import super
 
-# Load environment variables from .env file
-dotenv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
-if os.path.exists(dotenv_path):
-    load_dotenv(dotenv_path)
-else:
-    # Try loading from parent directory as fallback
-    parent_dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
-    if os.path.exists(parent_dotenv_path):
-        load_dotenv(parent_dotenv_path)
-    else:
-        load_dotenv()  # Try default locations
-
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -61,17 +108,33 @@ SAMPLE_RATE = 24000
 CHUNK_SIZE = 1024
 
 # OpenAI API Configuration
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "").strip()
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-realtime-preview-2024-10-01")
 OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "wss://api.openai.com/v1/realtime")
 OPENAI_VOICE = os.getenv("OPENAI_VOICE", "alloy")
 
+# Send raw PCM as binary WebSocket frames instead of base64-in-JSON. This drops
+# the 4/3 base64 inflation and all per-chunk encode/serialize CPU, but the
+# public Realtime API only documents JSON events -- enable only against an
+# endpoint that speaks the binary audio protocol.
+AUDIO_BINARY_FRAMES = os.getenv("AUDIO_BINARY_FRAMES", "0") == "1"
+
+# Standard OpenAI key shape: "sk-" plus at least 17 key characters. Compiled
+# once; also rejects empty/whitespace values that the old two-predicate check
+# let through.
+_KEY_RE = re.compile(r"^sk-[A-Za-z0-9_\-]{17,}$")
+
 # Check if we have an API key
 if not OPENAI_API_KEY:
     print("WARNING: No OpenAI API key found in environment variables or .env file.")
     print("The application will start, but you won't be able to use the OpenAI Realtime API.")
     print("Please set the OPENAI_API_KEY environment variable or add it to a .env file.")
 
+# In-process prompt cache keyed on (path, mtime_ns): the loader is called on
+# every overlay reopen and session start, so skip the file IO unless prompt.txt
+# actually changed. savePrompt_ clears it after writing.
+_PROMPT_CACHE = {}
+
 # Replace the DEFAULT_INSTRUCTIONS constant with a function that reads from a file
 def load_prompt_from_file():
     """Load the prompt from prompt.txt or return the default if file not found"""
@@ -81,11 +144,20 @@ IMPORTANT: Do not respond until the user has asked a complete question or given
 Listen carefully to the user's voice input and only reply when they have finished speaking.
 Keep your answers concise and relevant."""
     
-    if os.path.exists(prompt_path):
+    try:
+        cache_key = (prompt_path, os.stat(prompt_path).st_mtime_ns)
+    except OSError:
+        cache_key = None
+    if cache_key is not None and cache_key in _PROMPT_CACHE:
+        return _PROMPT_CACHE[cache_key]
+
+    if cache_key is not None:
         try:
             with open(prompt_path, 'r') as f:
                 prompt = f.read().strip()
             if prompt:  # Only use if not empty
+                _PROMPT_CACHE.clear()
+                _PROMPT_CACHE[cache_key] = prompt
                 return prompt
         except Exception as e:
             print(f"Error reading prompt file: {e}")
@@ -100,8 +172,115 @@ Keep your answers concise and relevant."""
     
     return default_prompt
 
-# Initialize PyAudio
-pya = pyaudio.PyAudio()
+# RMS over an int16 PCM chunk -- runs on the capture path for every chunk, so
+# JIT the sample loop with numba when available (the one-time compile is cached
+# on disk); otherwise fall back to vectorized numpy
+try:
+    import numba
+
+    @numba.njit(cache=True, fastmath=True)
+    def pcm_rms(samples):
+        s = 0.0
+        for i in range(samples.size):
+            v = float(samples[i])
+            s += v * v
+        return (s / samples.size) ** 0.5
+except ImportError:
+    def pcm_rms(samples):
+        samples = samples.astype(np.float64)
+        return float(np.sqrt(np.mean(samples * samples)))
+
+# One SSL context for every session: building a default context walks the
+# system trust store, which is not worth repeating per reconnect. Certificate
+# verification stays ON -- api.openai.com presents a valid cert. Set
+# OPENAI_INSECURE_SSL=1 only for debugging through intercepting proxies.
+def _build_ssl_context():
+    ctx = ssl.create_default_context()
+    if os.getenv("OPENAI_INSECURE_SSL", "0") == "1":
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+_SSL_CONTEXT = _build_ssl_context()
+
+# Rate limit for full-traceback reporting: a flapping connection can raise
+# several times per second, and formatting the whole stack each time turns a
+# transient blip into a logging storm. Full detail at most once per 5 s,
+# a one-line repr otherwise.
+_last_traceback_time = 0.0
+
+def format_error_details(e):
+    global _last_traceback_time
+    now = time.monotonic()
+    if now - _last_traceback_time >= 5.0:
+        _last_traceback_time = now
+        import traceback
+        return f"Details: {traceback.format_exc()}"
+    return f"Details: {e!r}"
+
+# Real-time backlog budget for the capture ring: if the consumer falls more
+# than ~250 ms behind (WS stall, loop hiccup), drop the oldest audio and
+# resume near live -- queueing it would only inflate end-to-end latency
+_MAX_BACKLOG = CHUNK_SIZE * 6
+
+# Hand-built frame for the audio append event: the payload is the only part
+# that varies and the base64 alphabet is JSON-safe, so string concatenation
+# replaces a json.dumps per chunk on the capture hot path
+_APPEND_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+_APPEND_SUFFIX = '"}'
+
+# Control-flow sentinels for the UI message queue. Identity-checked on drain,
+# so signalling costs no string comparison -- and a transcript line that
+# happens to say "STOP_SESSION" can never be mistaken for the real signal.
+QUIT_SIGNAL = object()
+STOP_SESSION = object()
+
+# UI text flushes are coalesced to roughly one per display frame (60 Hz);
+# streaming deltas that land inside the window ride along with the next flush
+_FLUSH_INTERVAL = 1.0 / 60.0
+
+# Precomputed modifier masks for the keyboard shortcut tables; resolving the
+# AppKit attributes per keystroke is measurable on the event-monitor path
+_CMD = AppKit.NSEventModifierFlagCommand
+_SHIFT = AppKit.NSEventModifierFlagShift
+_CMD_SHIFT = _CMD | _SHIFT
+
+# Collection-behavior bitmasks and window levels for the two presentation
+# modes, folded once at import instead of re-bridging three AppKit attributes
+# per toggle
+_BEHAVIOR_HIDDEN = (AppKit.NSWindowCollectionBehaviorCanJoinAllSpaces |
+                    AppKit.NSWindowCollectionBehaviorTransient |
+                    AppKit.NSWindowCollectionBehaviorIgnoresCycle)
+_BEHAVIOR_VISIBLE = (AppKit.NSWindowCollectionBehaviorCanJoinAllSpaces |
+                     AppKit.NSWindowCollectionBehaviorFullScreenAuxiliary)
+_LEVEL_HIDDEN = AppKit.NSNormalWindowLevel - 1
+_LEVEL_VISIBLE = AppKit.NSFloatingWindowLevel
+
+# Pre-bridged NSString constants: these titles are re-set on every toggle and
+# bridging the Python literal each time allocates a fresh NSString; with
+# cached instances the toggle becomes a pointer swap
+_TITLE_HIDE_ON = Foundation.NSString.stringWithString_("\u2713 Hide During Screen Sharing")
+_TITLE_HIDE_OFF = Foundation.NSString.stringWithString_("Hide During Screen Sharing")
+
+# Cached overlay font: fontWithName_size_ crosses the PyObjC bridge and runs a
+# font-descriptor lookup each call, so resolve Helvetica 18 once and reuse it
+_HELV18 = None
+
+def helv18():
+    global _HELV18
+    if _HELV18 is None:
+        _HELV18 = AppKit.NSFont.fontWithName_size_("Helvetica", 18.0)
+    return _HELV18
+
+# PyAudio instance, created on first use: PyAudio() spins up CoreAudio at
+# construction, which the --check-config path (and module importers) never need
+_pya = None
+
+def get_pya():
+    global _pya
+    if _pya is None:
+        _pya = pyaudio.PyAudio()
+    return _pya
 
 # For Python versions < 3.11
 if sys.version_info < (3, 11, 0):
@@ -156,11 +335,17 @@ class OverlayView(AppKit.NSView):
     def initWithFrame_(self, frame):
         super(OverlayView, self).initWithFrame_(frame)
         
-        # Create a tab view
-        self.tabView = AppKit.NSTabView.alloc().initWithFrame_(
-            AppKit.NSMakeRect(0, 0, frame.size.width, frame.size.height)
-        )
-        self.tabView.setAutoresizingMask_(AppKit.NSViewWidthSizable | AppKit.NSViewHeightSizable)
+        # Hoist the hot AppKit lookups: every dotted access below is a module
+        # __getattr__ plus a bridge metadata lookup, and this method makes ~40
+        # of them back to back on the cold-launch path
+        NSMakeRect = AppKit.NSMakeRect
+        whiteColor = AppKit.NSColor.whiteColor()
+        widthHeightSizable = AppKit.NSViewWidthSizable | AppKit.NSViewHeightSizable
+        
+        # Create a tab view (frame is the content view's bounds, so reuse it
+        # instead of rebuilding an identical rect)
+        self.tabView = AppKit.NSTabView.alloc().initWithFrame_(frame)
+        self.tabView.setAutoresizingMask_(widthHeightSizable)
         self.addSubview_(self.tabView)
         
         # Create the main tab
@@ -178,27 +363,34 @@ class OverlayView(AppKit.NSView):
         mainTab.setView_(mainView)
         
         # Create a scroll view to contain the text view for the main tab
-        scrollView = AppKit.NSScrollView.alloc().initWithFrame_(
-            AppKit.NSMakeRect(0, 0, mainView.bounds().size.width, mainView.bounds().size.height)
-        )
+        scrollView = AppKit.NSScrollView.alloc().initWithFrame_(mainView.bounds())
         scrollView.setHasVerticalScroller_(True)
         scrollView.setAutohidesScrollers_(True)
         scrollView.setBorderType_(AppKit.NSNoBorder)
         scrollView.setDrawsBackground_(False)
-        scrollView.setAutoresizingMask_(AppKit.NSViewWidthSizable | AppKit.NSViewHeightSizable)
+        scrollView.setAutoresizingMask_(widthHeightSizable)
         
         # Create the text view for the main tab
         self.textView = AppKit.NSTextView.alloc().initWithFrame_(scrollView.contentView().bounds())
         self.textView.setEditable_(False)
         self.textView.setSelectable_(True)
         self.textView.setDrawsBackground_(False)
-        self.textView.setFont_(AppKit.NSFont.fontWithName_size_("Helvetica", 18.0))
-        self.textView.setTextColor_(AppKit.NSColor.whiteColor())
-        self.textView.setAutoresizingMask_(AppKit.NSViewWidthSizable | AppKit.NSViewHeightSizable)
+        self.textView.setFont_(helv18())
+        self.textView.setTextColor_(whiteColor)
+        self.textView.setAutoresizingMask_(widthHeightSizable)
         
         # Configure text container
         self.textView.textContainer().setLineFragmentPadding_(10.0)
         self.textView.textContainer().setWidthTracksTextView_(True)
+
+        # Cache the text attributes once; appendText_ runs for every streamed
+        # token and rebuilding the dictionary (plus the font lookup) per call
+        # is the dominant UI cost
+        self._textAttrs = AppKit.NSDictionary.dictionaryWithObjects_forKeys_(
+            [whiteColor, helv18()],
+            [AppKit.NSForegroundColorAttributeName, AppKit.NSFontAttributeName]
+        )
+        self._textLen = 0  # running length, avoids string().length() round-trips
         
         # Add text view to scroll view
         scrollView.setDocumentView_(self.textView)
@@ -214,14 +406,15 @@ class OverlayView(AppKit.NSView):
         promptTab.setView_(promptView)
         
         # Create a scroll view for the prompt editor
+        promptBounds = promptView.bounds()
         promptScrollView = AppKit.NSScrollView.alloc().initWithFrame_(
-            AppKit.NSMakeRect(10, 50, promptView.bounds().size.width - 20, promptView.bounds().size.height - 60)
+            NSMakeRect(10, 50, promptBounds.size.width - 20, promptBounds.size.height - 60)
         )
         promptScrollView.setHasVerticalScroller_(True)
         promptScrollView.setAutohidesScrollers_(True)
         promptScrollView.setBorderType_(AppKit.NSBezelBorder)  # Add border for better visibility
         promptScrollView.setDrawsBackground_(False)
-        promptScrollView.setAutoresizingMask_(AppKit.NSViewWidthSizable | AppKit.NSViewHeightSizable)
+        promptScrollView.setAutoresizingMask_(widthHeightSizable)
         
         # Create the prompt editor text view
         self.promptTextView = AppKit.NSTextView.alloc().initWithFrame_(promptScrollView.contentView().bounds())
@@ -230,8 +423,8 @@ class OverlayView(AppKit.NSView):
         self.promptTextView.setDrawsBackground_(True)
         self.promptTextView.setBackgroundColor_(AppKit.NSColor.darkGrayColor())
         self.promptTextView.setFont_(AppKit.NSFont.fontWithName_size_("Menlo", 14.0))
-        self.promptTextView.setTextColor_(AppKit.NSColor.whiteColor())
-        self.promptTextView.setAutoresizingMask_(AppKit.NSViewWidthSizable | AppKit.NSViewHeightSizable)
+        self.promptTextView.setTextColor_(whiteColor)
+        self.promptTextView.setAutoresizingMask_(widthHeightSizable)
         
         # Configure prompt text container
         self.promptTextView.textContainer().setLineFragmentPadding_(10.0)
@@ -245,7 +438,7 @@ class OverlayView(AppKit.NSView):
         
         # Add a "Save Prompt" button
         saveButton = AppKit.NSButton.alloc().initWithFrame_(
-            AppKit.NSMakeRect(10, 10, 120, 30)
+            NSMakeRect(10, 10, 120, 30)
         )
         saveButton.setTitle_("Save Prompt")
         saveButton.setBezelStyle_(AppKit.NSBezelStyleRounded)
@@ -255,14 +448,14 @@ class OverlayView(AppKit.NSView):
         
         # Add a label above the prompt editor
         promptLabel = AppKit.NSTextField.alloc().initWithFrame_(
-            AppKit.NSMakeRect(10, promptView.bounds().size.height - 30, promptView.bounds().size.width - 20, 20)
+            NSMakeRect(10, promptBounds.size.height - 30, promptBounds.size.width - 20, 20)
         )
         promptLabel.setStringValue_("Edit the prompt used for the OpenAI Realtime session:")
         promptLabel.setEditable_(False)
         promptLabel.setSelectable_(False)
         promptLabel.setDrawsBackground_(False)
         promptLabel.setBezeled_(False)
-        promptLabel.setTextColor_(AppKit.NSColor.whiteColor())
+        promptLabel.setTextColor_(whiteColor)
         promptLabel.setAutoresizingMask_(AppKit.NSViewWidthSizable | AppKit.NSViewMinYMargin)
         promptView.addSubview_(promptLabel)
         
@@ -285,6 +478,7 @@ class OverlayView(AppKit.NSView):
             try:
                 with open(prompt_path, 'w') as f:
                     f.write(prompt_text)
+                _PROMPT_CACHE.clear()
                 # Flash the button to indicate success
                 sender.setTitle_("Saved!")
                 def restore_title():
@@ -323,20 +517,27 @@ class OverlayView(AppKit.NSView):
         # Append text to the text view
         if not text:
             return
-            
-        # Fix: Create attributes dictionary correctly
-        attributes = AppKit.NSDictionary.dictionaryWithObjects_forKeys_(
-            [AppKit.NSColor.whiteColor(), AppKit.NSFont.fontWithName_size_("Helvetica", 18.0)],
-            [AppKit.NSForegroundColorAttributeName, AppKit.NSFontAttributeName]
-        )
-        
+
         attrString = AppKit.NSAttributedString.alloc().initWithString_attributes_(
             text,
-            attributes
+            self._textAttrs
         )
-        
-        self.textView.textStorage().appendAttributedString_(attrString)
-        self.textView.scrollRangeToVisible_(AppKit.NSMakeRange(self.textView.string().length(), 0))
+
+        # beginEditing/endEditing coalesces the layout invalidation into one pass
+        textStorage = self.textView.textStorage()
+        textStorage.beginEditing()
+        textStorage.appendAttributedString_(attrString)
+        # attrString.length() is UTF-16 code units, matching NSTextStorage indexing
+        self._textLen += attrString.length()
+        # Trim the oldest text once the transcript passes ~200 KB so layout and
+        # scrolling stay O(1) over long sessions instead of growing unbounded
+        if self._textLen > 200_000:
+            drop = self._textLen - 150_000
+            textStorage.deleteCharactersInRange_(AppKit.NSMakeRange(0, drop))
+            self._textLen -= drop
+        textStorage.endEditing()
+
+        self.textView.scrollRangeToVisible_(AppKit.NSMakeRange(self._textLen, 0))
 
     def addTransparencyControls(self, parentView=None):
         """Add transparency controls to the specified view or self if none provided."""
@@ -344,10 +545,15 @@ class OverlayView(AppKit.NSView):
         if parentView is None:
             parentView = self
         
+        # Same hoist as initWithFrame_: four buttons in a row means repeated
+        # NSMakeRect/bezel-style lookups otherwise
+        NSMakeRect = Foundation.NSMakeRect
+        bezelRounded = AppKit.NSBezelStyleRounded
+        
         # Create a container for the buttons
         controlsHeight = 30
         controlsWidth = 200  # Wider to accommodate more buttons
-        controlsFrame = Foundation.NSMakeRect(
+        controlsFrame = NSMakeRect(
             parentView.bounds().size.width - controlsWidth - 10,
             10,
             controlsWidth,
@@ -360,37 +566,37 @@ class OverlayView(AppKit.NSView):
         
         # Add decrease opacity button
         decreaseButton = AppKit.NSButton.alloc().initWithFrame_(
-            Foundation.NSMakeRect(0, 0, 30, controlsHeight)
+            NSMakeRect(0, 0, 30, controlsHeight)
         )
         decreaseButton.setTitle_("-")
-        decreaseButton.setBezelStyle_(AppKit.NSBezelStyleRounded)
+        decreaseButton.setBezelStyle_(bezelRounded)
         self.decreaseButton = decreaseButton
         controlsView.addSubview_(decreaseButton)
         
         # Add increase opacity button
         increaseButton = AppKit.NSButton.alloc().initWithFrame_(
-            Foundation.NSMakeRect(40, 0, 30, controlsHeight)
+            NSMakeRect(40, 0, 30, controlsHeight)
         )
         increaseButton.setTitle_("+")
-        increaseButton.setBezelStyle_(AppKit.NSBezelStyleRounded)
+        increaseButton.setBezelStyle_(bezelRounded)
         self.increaseButton = increaseButton
         controlsView.addSubview_(increaseButton)
         
         # Add start session button
         startButton = AppKit.NSButton.alloc().initWithFrame_(
-            Foundation.NSMakeRect(80, 0, 50, controlsHeight)
+            NSMakeRect(80, 0, 50, controlsHeight)
         )
         startButton.setTitle_("Start")
-        startButton.setBezelStyle_(AppKit.NSBezelStyleRounded)
+        startButton.setBezelStyle_(bezelRounded)
         self.startButton = startButton
         controlsView.addSubview_(startButton)
         
         # Add stop session button
         stopButton = AppKit.NSButton.alloc().initWithFrame_(
-            Foundation.NSMakeRect(140, 0, 50, controlsHeight)
+            NSMakeRect(140, 0, 50, controlsHeight)
         )
         stopButton.setTitle_("Stop")
-        stopButton.setBezelStyle_(AppKit.NSBezelStyleRounded)
+        stopButton.setBezelStyle_(bezelRounded)
         self.stopButton = stopButton
         controlsView.addSubview_(stopButton)
 
@@ -422,6 +628,7 @@ class OverlayView(AppKit.NSView):
         
         # Get available audio devices
         devices = []
+        pya = get_pya()
         info = pya.get_host_api_info_by_index(0)
         num_devices = info.get('deviceCount')
         
@@ -459,6 +666,47 @@ class OverlayView(AppKit.NSView):
             self.devicePopup.selectItemAtIndex_(blackhole_index)
 
 
+class UIMessageQueue:
+    """Bounded message queue that drops the oldest entry instead of blocking.
+
+    A runaway producer (e.g. a flapping connection spamming errors) must never
+    block the audio thread or OOM the UI; dropping old transcript lines is the
+    right failure mode for a live overlay.
+
+    Single producer (the OpenAI thread), single consumer (the main thread), so
+    a deque -- whose append/popleft are atomic under the GIL -- plus a wake
+    flag beats queue.Queue's lock-and-condition handshake on every message.
+    The first put after a drain signals the delegate's CFRunLoop source; while
+    the flag is set, further puts skip the bridge crossing entirely.
+    """
+
+    def __init__(self, maxsize=0, delegate=None):
+        self.delegate = delegate
+        self._msgs = deque(maxlen=maxsize or None)  # maxlen drops oldest
+        self._wake_pending = threading.Event()
+
+    def put(self, item):
+        self._msgs.append(item)
+        if self.delegate is not None and not self._wake_pending.is_set():
+            self._wake_pending.set()
+            self.delegate.performSelectorOnMainThread_withObject_waitUntilDone_(
+                "checkMessages:", None, False
+            )
+
+    def drain(self):
+        """Pop everything queued so far (main thread only)."""
+        # Clear first: a put racing with the drain re-arms the wakeup rather
+        # than being silently swallowed
+        self._wake_pending.clear()
+        messages = []
+        while True:
+            try:
+                messages.append(self._msgs.popleft())
+            except IndexError:
+                break
+        return messages
+
+
 class AppDelegate(AppKit.NSObject):
     """The application delegate that handles app lifecycle and keyboard shortcuts."""
     
@@ -466,7 +714,14 @@ class AppDelegate(AppKit.NSObject):
         self = super(AppDelegate, self).init()
         if self is None:
             return None
-            
+        
+        # Pre-declare attributes the cleanup paths test, so they can use a
+        # plain truthiness check instead of hasattr (which builds and
+        # discards an AttributeError per probe)
+        self.overlayView = None
+        self.eventTap = None
+        self.localEventTap = None
+        
         # Create a window
         screenRect = AppKit.NSScreen.mainScreen().frame()
         windowWidth = 1000
@@ -493,25 +748,54 @@ class AppDelegate(AppKit.NSObject):
         self.overlayView = OverlayView.alloc().initWithFrame_(self.window.contentView().bounds())
         self.window.setContentView_(self.overlayView)
         
-        # Set up the message queue for communication between threads
-        self.message_queue = queue.Queue()
+        # Set up the message queue for communication between threads; it wakes
+        # this delegate on the main thread whenever a message arrives
+        self.message_queue = UIMessageQueue(maxsize=10_000, delegate=self)
         
         # Flag to track if OpenAI session is running
         self.openai_running = False
         self.openai_thread = None
+        # Set by the UI to request session shutdown; the asyncio side blocks
+        # on it in a worker thread instead of polling openai_running
+        self.stop_event = threading.Event()
+        
+        # One long-lived asyncio loop thread shared by every session: loop
+        # (and uvloop) setup is paid once, and sessions are submitted to it
+        # with run_coroutine_threadsafe instead of asyncio.run per start
+        self._async_loop = None
+        self._async_loop_ready = threading.Event()
+        self._async_loop_thread = threading.Thread(
+            target=self._runAsyncLoop, daemon=True
+        )
+        self._async_loop_thread.start()
+        
+        # Flush coalescing state (see checkMessages_)
+        self._lastFlush = 0.0
+        self._flushScheduled = False
+        
+        # Debounced opacity state (see _nudgeAlpha_)
+        self._target_alpha = None
+        self._alphaApplyScheduled = False
+        self._lastAlphaPct = None
+        
+        # Precomputed (modifiers, key) -> handler tables: the event monitors
+        # run on every keystroke, so dispatch is a single dict lookup instead
+        # of a chain of flag tests and string compares
+        self._globalKeyTable = {
+            (_CMD_SHIFT, "h"): self.toggleWindowVisibility,
+            (_CMD_SHIFT, "="): self.growWindow,
+            (_CMD_SHIFT, "-"): self.shrinkWindow,
+            (_CMD_SHIFT, "q"): self.quitApp,
+            (_CMD_SHIFT, "p"): self.togglePresentation,
+        }
+        self._localKeyTable = {
+            (_CMD_SHIFT, "t"): self.decreaseOpacity,
+            (_CMD_SHIFT, "y"): self.increaseOpacity,
+        }
         
         # Register for global keyboard events
         self.setupKeyboardShortcuts()
         
-        # Start a timer to check for new messages
-        self.timer = AppKit.NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
-            0.1,  # Check every 100ms
-            self,
-            "checkMessages:",
-            None,
-            True
-        )
-        
         # Create status bar item
         self.setupStatusBar()
         
@@ -563,92 +847,121 @@ class AppDelegate(AppKit.NSObject):
         )
     
     def handleKeyDown_(self, event):
-        # Check for our keyboard shortcuts
-        flags = event.modifierFlags()
-        cmd_shift = (flags & AppKit.NSEventModifierFlagCommand) and (flags & AppKit.NSEventModifierFlagShift)
-        
-        if not cmd_shift:
-            return
-            
-        key = event.charactersIgnoringModifiers()
-        
-        if key == "h":  # Cmd+Shift+H to toggle visibility
-            if self.window.isVisible():
-                self.window.orderOut_(None)
-            else:
-                self.window.makeKeyAndOrderFront_(None)
-                
-        elif key == "=":  # Cmd+Shift++ to increase size
-            frame = self.window.frame()
-            newFrame = Foundation.NSMakeRect(
-                frame.origin.x - 25,
-                frame.origin.y - 25,
-                frame.size.width + 50,
-                frame.size.height + 50
-            )
-            self.window.setFrame_display_animate_(newFrame, True, True)
-            
-        elif key == "-":  # Cmd+Shift+- to decrease size
-            frame = self.window.frame()
-            newFrame = Foundation.NSMakeRect(
-                frame.origin.x + 25,
-                frame.origin.y + 25,
-                frame.size.width - 50,
-                frame.size.height - 50
-            )
-            self.window.setFrame_display_animate_(newFrame, True, True)
-            
-        elif key == "q":  # Cmd+Shift+Q to quit
-            AppKit.NSApplication.sharedApplication().terminate_(None)
-            
-        elif key == "p":  # Cmd+Shift+P to toggle presentation mode
-            self.togglePresentationMode_(self)
+        # Single dict lookup against the precomputed shortcut table
+        handler = self._globalKeyTable.get(
+            (event.modifierFlags() & _CMD_SHIFT, event.charactersIgnoringModifiers())
+        )
+        if handler:
+            handler()
     
     def handleLocalKeyDown_(self, event):
         # This handles keyboard events when our window is active
-        flags = event.modifierFlags()
-        cmd_shift = (flags & AppKit.NSEventModifierFlagCommand) and (flags & AppKit.NSEventModifierFlagShift)
-        
-        if cmd_shift:
-            key = event.charactersIgnoringModifiers()
-            
-            if key == "t":  # Cmd+Shift+T to decrease opacity
-                current_alpha = self.window.alphaValue()
-                new_alpha = max(0.2, current_alpha - 0.1)
-                self.window.setAlphaValue_(new_alpha)
-                self.message_queue.put(f"Transparency set to {int(new_alpha * 100)}%")
-                return None  # Consume the event
-            
-            elif key == "y":  # Cmd+Shift+Y to increase opacity
-                current_alpha = self.window.alphaValue()
-                new_alpha = min(1.0, current_alpha + 0.1)
-                self.window.setAlphaValue_(new_alpha)
-                self.message_queue.put(f"Transparency set to {int(new_alpha * 100)}%")
-                return None  # Consume the event
+        handler = self._localKeyTable.get(
+            (event.modifierFlags() & _CMD_SHIFT, event.charactersIgnoringModifiers())
+        )
+        if handler:
+            handler()
+            return None  # Consume the event
         
         # For other keys, pass the event through
         return event
     
-    def checkMessages_(self, timer):
-        # Check for new messages from the OpenAI thread
-        try:
-            while True:
-                message = self.message_queue.get_nowait()
-                
-                # Use performSelectorOnMainThread to safely update UI
-                self.performSelectorOnMainThread_withObject_waitUntilDone_(
-                    "updateUIWithMessage:",
-                    message,
-                    False
-                )
-                
-        except queue.Empty:
-            pass
+    def toggleWindowVisibility(self):
+        # Cmd+Shift+H to toggle visibility
+        if self.window.isVisible():
+            self.window.orderOut_(None)
+        else:
+            self.window.makeKeyAndOrderFront_(None)
+    
+    def growWindow(self):
+        # Cmd+Shift++ to increase size
+        frame = self.window.frame()
+        newFrame = Foundation.NSMakeRect(
+            frame.origin.x - 25,
+            frame.origin.y - 25,
+            frame.size.width + 50,
+            frame.size.height + 50
+        )
+        self.window.setFrame_display_animate_(newFrame, True, True)
+    
+    def shrinkWindow(self):
+        # Cmd+Shift+- to decrease size
+        frame = self.window.frame()
+        newFrame = Foundation.NSMakeRect(
+            frame.origin.x + 25,
+            frame.origin.y + 25,
+            frame.size.width - 50,
+            frame.size.height - 50
+        )
+        self.window.setFrame_display_animate_(newFrame, True, True)
+    
+    def quitApp(self):
+        # Cmd+Shift+Q to quit
+        AppKit.NSApplication.sharedApplication().terminate_(None)
+    
+    def togglePresentation(self):
+        # Cmd+Shift+P to toggle presentation mode
+        self.togglePresentationMode_(self)
+    
+    def decreaseOpacity(self):
+        # Cmd+Shift+T to decrease opacity
+        self.decreaseOpacity_(None)
+    
+    def increaseOpacity(self):
+        # Cmd+Shift+Y to increase opacity
+        self.increaseOpacity_(None)
+    
+    def checkMessages_(self, sender):
+        # Align flushes with the display refresh: a flush more often than once
+        # per frame only buys extra layout passes the compositor never shows.
+        # A free-running CVDisplayLink would give the same cadence but burns
+        # an idle wakeup per frame forever; deferring on demand coalesces just
+        # as well and costs nothing while the overlay is quiet.
+        if self._flushScheduled:
+            return
+        elapsed = time.monotonic() - self._lastFlush
+        if elapsed >= _FLUSH_INTERVAL:
+            self.flushMessages_(None)
+        else:
+            self._flushScheduled = True
+            self.performSelector_withObject_afterDelay_(
+                "flushMessages:", None, _FLUSH_INTERVAL - elapsed
+            )
+    
+    def flushMessages_(self, sender):
+        # Drain everything queued from the OpenAI thread in one pass and
+        # coalesce it into a single append -- streaming deltas can arrive
+        # dozens of times per frame and each separate append would trigger
+        # its own layout pass
+        self._flushScheduled = False
+        self._lastFlush = time.monotonic()
+        # Sentinels are control signals for the worker thread, not transcript
+        # text; identity comparison keeps the drain loop cheap
+        messages = [m for m in self.message_queue.drain()
+                    if m is not QUIT_SIGNAL and m is not STOP_SESSION]
+
+        if messages:
+            # Already on the main thread, so update the view directly
+            self.overlayView.appendText_("".join(messages))
     
     def updateUIWithMessage_(self, message):
         # Update the UI with a new message
         self.overlayView.appendText_(message)
     
+    def _runAsyncLoop(self):
+        """Body of the persistent asyncio loop thread."""
+        # uvloop (libuv) is a drop-in event loop with much lower socket/WS
+        # overhead than the stock selector loop; skip silently if missing
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+        self._async_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._async_loop)
+        self._async_loop_ready.set()
+        self._async_loop.run_forever()
+    
     def run_openai_loop(self):
         # Run the asyncio event loop in this thread
         self.message_queue.put("🔄 Initializing OpenAI session...")
@@ -660,13 +973,20 @@ class AppDelegate(AppKit.NSObject):
                 return
                 
             # Verify API key format
-            if not OPENAI_API_KEY.startswith("sk-") or len(OPENAI_API_KEY) < 20:
+            if not _KEY_RE.match(OPENAI_API_KEY):
                 self.message_queue.put("⚠️ Warning: Your API key doesn't look like a standard OpenAI key.")
                 self.message_queue.put("It should start with 'sk-' and be at least 20 characters long.")
                 self.message_queue.put("Continuing anyway, but may fail to connect...")
                 
-            self.message_queue.put("🔄 Starting asyncio event loop...")
-            asyncio.run(self.openai_main())
+            # Submit the session to the persistent loop thread and supervise
+            # it from here; this thread only exists for error reporting and
+            # so the join() calls in the stop paths keep working
+            if not self._async_loop_ready.wait(5.0):
+                raise RuntimeError("asyncio loop thread failed to start")
+            future = asyncio.run_coroutine_threadsafe(
+                self.openai_main(), self._async_loop
+            )
+            future.result()
         except Exception as e:
             import traceback
             error_text = traceback.format_exc()
@@ -710,8 +1030,7 @@ class AppDelegate(AppKit.NSObject):
             except Exception as e:
                 error_msg = f"⚠️ Error: {str(e)}"
                 self.message_queue.put(error_msg)
-                import traceback
-                self.message_queue.put(f"Details: {traceback.format_exc()}")
+                self.message_queue.put(format_error_details(e))
                 
                 if self.openai_running:  # Only reconnect if still running
                     self.message_queue.put("🔁 Reconnecting in 2 seconds...")
@@ -788,7 +1107,7 @@ class AppDelegate(AppKit.NSObject):
             # Use a combination of settings that ensure the window won't appear in recordings
             
             # 1. Set the window level to a background level
-            self.window.setLevel_(AppKit.NSNormalWindowLevel - 1)
+            self.window.setLevel_(_LEVEL_HIDDEN)
             
             # 2. Set the window to be excluded from window lists
             self.window.setExcludedFromWindowsMenu_(True)
@@ -801,45 +1120,43 @@ class AppDelegate(AppKit.NSObject):
             self.window.setSharingType_(AppKit.NSWindowSharingNone)
             
             # 5. Set appropriate collection behavior
-            self.window.setCollectionBehavior_(
-                AppKit.NSWindowCollectionBehaviorCanJoinAllSpaces | 
-                AppKit.NSWindowCollectionBehaviorTransient |
-                AppKit.NSWindowCollectionBehaviorIgnoresCycle
-            )
+            self.window.setCollectionBehavior_(_BEHAVIOR_HIDDEN)
             
             # Update menu text
-            self.presentationModeItem.setTitle_("✓ Hide During Screen Sharing")
+            self.presentationModeItem.setTitle_(_TITLE_HIDE_ON)
         else:
             # Make window visible during screen sharing
-            self.window.setLevel_(AppKit.NSFloatingWindowLevel)
+            self.window.setLevel_(_LEVEL_VISIBLE)
             self.window.setExcludedFromWindowsMenu_(False)
             self.window.setCanHide_(False)
             self.window.setSharingType_(AppKit.NSWindowSharingReadOnly)
-            self.window.setCollectionBehavior_(
-                AppKit.NSWindowCollectionBehaviorCanJoinAllSpaces | 
-                AppKit.NSWindowCollectionBehaviorFullScreenAuxiliary
-            )
+            self.window.setCollectionBehavior_(_BEHAVIOR_VISIBLE)
             
             # Update menu text
-            self.presentationModeItem.setTitle_("Hide During Screen Sharing")
+            self.presentationModeItem.setTitle_(_TITLE_HIDE_OFF)
 
     def applicationWillTerminate_(self, notification):
         """Clean up resources when the application is about to terminate."""
         # Stop the event taps for keyboard monitoring
-        if hasattr(self, 'eventTap') and self.eventTap:
+        if self.eventTap:
             AppKit.NSEvent.removeMonitor_(self.eventTap)
         
-        if hasattr(self, 'localEventTap') and self.localEventTap:
+        if self.localEventTap:
             AppKit.NSEvent.removeMonitor_(self.localEventTap)
         
         # Clean up audio resources
-        if hasattr(self, 'openai_thread') and self.openai_thread.is_alive():
+        if self.openai_thread and self.openai_thread.is_alive():
             # Signal the thread to stop
-            self.message_queue.put("QUIT_SIGNAL")
+            self.stop_event.set()
+            self.message_queue.put(QUIT_SIGNAL)
             
             # Give it a moment to clean up
             self.openai_thread.join(0.5)
         
+        # Wind down the persistent asyncio loop thread
+        if self._async_loop is not None:
+            self._async_loop.call_soon_threadsafe(self._async_loop.stop)
+        
         # Log termination
         print("Application terminated")
 
@@ -866,43 +1183,56 @@ class AppDelegate(AppKit.NSObject):
         )
 
     def processKeyEvent_(self, event):
-        # Process keyboard events
-        flags = event.modifierFlags()
-        cmd_shift = (flags & AppKit.NSEventModifierFlagCommand) and (flags & AppKit.NSEventModifierFlagShift)
+        # Early-out non-shortcut keys with one integer AND against the
+        # precomputed mask before touching anything else -- this runs for
+        # every key down while the window is active
+        if (event.modifierFlags() & _CMD_SHIFT) != _CMD_SHIFT:
+            return event
         
-        if cmd_shift:
-            key = event.charactersIgnoringModifiers()
-            
-            if key == "t":  # Cmd+Shift+T to decrease opacity
-                current_alpha = self.window.alphaValue()
-                new_alpha = max(0.2, current_alpha - 0.1)
-                self.window.setAlphaValue_(new_alpha)
-                self.message_queue.put(f"Transparency set to {int(new_alpha * 100)}%")
-                return None  # Consume the event
-            
-            elif key == "y":  # Cmd+Shift+Y to increase opacity
-                current_alpha = self.window.alphaValue()
-                new_alpha = min(1.0, current_alpha + 0.1)
-                self.window.setAlphaValue_(new_alpha)
-                self.message_queue.put(f"Transparency set to {int(new_alpha * 100)}%")
-                return None  # Consume the event
+        key = event.charactersIgnoringModifiers()
+        
+        if key == "t":  # Cmd+Shift+T to decrease opacity
+            self.decreaseOpacity_(None)
+            return None  # Consume the event
+        
+        if key == "y":  # Cmd+Shift+Y to increase opacity
+            self.increaseOpacity_(None)
+            return None  # Consume the event
         
         # For other keys, pass the event through
         return event
 
     def decreaseOpacity_(self, sender):
         """Decrease the window opacity."""
-        current_alpha = self.window.alphaValue()
-        new_alpha = max(0.2, current_alpha - 0.1)
-        self.window.setAlphaValue_(new_alpha)
-        self.message_queue.put(f"Transparency set to {int(new_alpha * 100)}%")
+        self._nudgeAlpha_(-0.1)
 
     def increaseOpacity_(self, sender):
         """Increase the window opacity."""
-        current_alpha = self.window.alphaValue()
-        new_alpha = min(1.0, current_alpha + 0.1)
-        self.window.setAlphaValue_(new_alpha)
-        self.message_queue.put(f"Transparency set to {int(new_alpha * 100)}%")
+        self._nudgeAlpha_(0.1)
+
+    def _nudgeAlpha_(self, delta):
+        """Adjust the target opacity, applying it at most once per frame.
+
+        A held shortcut key repeats fast enough to flood setAlphaValue_ with
+        CALayer commits; tracking a pending target and applying the latest
+        value after a one-frame delay collapses the flood to one commit.
+        """
+        base = self._target_alpha if self._target_alpha is not None else self.window.alphaValue()
+        new_alpha = min(1.0, max(0.2, base + delta))
+        self._target_alpha = new_alpha
+        if not self._alphaApplyScheduled:
+            self._alphaApplyScheduled = True
+            self.performSelector_withObject_afterDelay_("applyAlpha:", None, _FLUSH_INTERVAL)
+        # Only post the percentage when it actually changed
+        pct = int(new_alpha * 100)
+        if pct != self._lastAlphaPct:
+            self._lastAlphaPct = pct
+            self.message_queue.put(f"Transparency set to {pct}%")
+
+    def applyAlpha_(self, sender):
+        self._alphaApplyScheduled = False
+        if self._target_alpha is not None:
+            self.window.setAlphaValue_(self._target_alpha)
 
     def startOpenAISession_(self, sender):
         """Start the OpenAI session."""
@@ -926,6 +1256,7 @@ class AppDelegate(AppKit.NSObject):
         
         # Clear the view for a clean start
         self.clearTextView_(None)
+        self.stop_event.clear()
         
         # Start the session with better instructions
         self.overlayView.appendText_(f"🚀 Starting OpenAI session to capture system audio\n")
@@ -939,8 +1270,9 @@ class AppDelegate(AppKit.NSObject):
 
     def clearTextView_(self, sender):
         """Clear the text view - safe to call from main thread."""
-        if hasattr(self, 'overlayView') and hasattr(self.overlayView, 'textView'):
+        if self.overlayView:
             self.overlayView.textView.setString_("")
+            self.overlayView._textLen = 0
             self.overlayView.appendText_("🎙️ OpenAI Realtime API Overlay\n")
             self.overlayView.appendText_("Session starting...\n\n")
 
@@ -952,12 +1284,13 @@ class AppDelegate(AppKit.NSObject):
         
         self.message_queue.put("🛑 Stopping OpenAI session...")
         self.openai_running = False
+        self.stop_event.set()
         
         # Put a stop signal in the queue that the audio loop will check for
-        self.message_queue.put("STOP_SESSION")
+        self.message_queue.put(STOP_SESSION)
         
         # Clean up audio resources
-        if hasattr(self, 'openai_thread') and self.openai_thread:
+        if self.openai_thread:
             try:
                 # Give the thread a moment to clean up
                 self.openai_thread.join(1.0)  # Increased timeout to ensure cleanup
@@ -968,21 +1301,52 @@ class AppDelegate(AppKit.NSObject):
 
 
 class OpenAIRealtimeLoop:
+    # Resolved capture device, shared across sessions: Core Audio enumeration
+    # is slow and run() reconnects after every failure, so scan once and only
+    # rescan if opening the cached device fails (e.g. it was unplugged)
+    _cached_capture_device = None  # (blackhole_index_or_None, setup_logged)
+
     def __init__(self, message_queue):
         self.message_queue = message_queue
         self.ws = None
         self.audio_stream = None
         self.running = True
         self.tasks = []
+        self._tx = None  # outbound frame queue, created per session
         
-        # Create SSL context
-        self.ssl_context = ssl.create_default_context()
-        self.ssl_context.check_hostname = False
-        self.ssl_context.verify_mode = ssl.CERT_NONE
+        # Shared module-level SSL context (built once at import)
+        self.ssl_context = _SSL_CONTEXT
         
         self.response_started = False
         self.current_text_response = ''
-        
+
+        # Pre-serialized control frame; sent on connect and after every turn
+        self._response_create = '{"type":"response.create"}'
+
+        # Event dispatch table for receive_events; the text-delta fast path
+        # is handled inline before this lookup
+        self._handlers = {
+            "error": self._on_error,
+            "response.done": self._on_response_done,
+            "turn_detected.start": self._on_turn_start,
+            "turn_detected.end": self._on_turn_end,
+        }
+
+        # Silence diagnostics for the capture loop
+        self._silent_chunks = 0
+        self._silence_warned = False
+
+        # Preallocated capture ring buffer (~2.7 s at 24 kHz). The PortAudio
+        # callback writes into it and the asyncio side reads CHUNK_SIZE slices,
+        # so steady-state capture allocates no new buffers.
+        self._ring = np.zeros(CHUNK_SIZE * 64, dtype=np.int16)
+        self._ring_head = 0  # total frames written (callback thread)
+        self._ring_tail = 0  # total frames consumed (asyncio loop)
+        self._audio_event = None  # created on the session's event loop
+        self._loop = None
+        self._dropped_frames = 0
+        self._last_drop_log = 0.0
+
         # VAD Configuration
         self.vad_config = {
             "type": "server_vad",
@@ -1019,27 +1383,42 @@ class OpenAIRealtimeLoop:
         }
         
         try:
-            # Direct connection approach like your working example
-            self.ws = await websockets.connect(
+            # compression=None: the dominant payload is base64 audio, which is
+            # high-entropy -- deflating it per frame burns CPU under the GIL
+            # for near-zero wire savings (this reverses the earlier tuned
+            # permessage-deflate experiment, which only paid off on the small
+            # text envelopes). max_queue=None and a 1 MB write buffer keep the
+            # library from throttling the single writer during audio bursts.
+            connect_kwargs = {
+                "ssl": self.ssl_context,
+                "compression": None,
+                "max_size": None,
+                "max_queue": None,
+                "write_limit": 2 ** 20,
+                "ping_interval": 20,
+                "ping_timeout": 20,
+            }
+            # The new asyncio implementation renamed extra_headers to
+            # additional_headers; pass whichever the imported connect() takes
+            connect_kwargs["additional_headers" if _WS_RAW_RECV else "extra_headers"] = headers
+            self.ws = await ws_connect(
                 f"{OPENAI_BASE_URL}?model={OPENAI_MODEL}",
-                ssl=self.ssl_context,
-                additional_headers=headers
+                **connect_kwargs
             )
             self.message_queue.put("✅ Connected to OpenAI Realtime API")
             
             # Configure session
-            await self.ws.send(json.dumps({
+            await self.ws.send(json_dumps({
                 "type": "session.update",
                 "session": self.session_config
             }))
             
             # Initialize conversation
-            await self.ws.send(json.dumps({"type": "response.create"}))
+            await self.ws.send(self._response_create)
             return True
         except Exception as e:
             self.message_queue.put(f"❌ Error connecting to OpenAI: {str(e)}")
-            import traceback
-            self.message_queue.put(f"Details: {traceback.format_exc()}")
+            self.message_queue.put(format_error_details(e))
             return False
     
     async def receive_events(self):
@@ -1048,86 +1427,270 @@ class OpenAIRealtimeLoop:
             self.message_queue.put("⚠️ WebSocket not connected")
             return
             
+        # Delta batching: deltas arrive one token at a time, and forwarding
+        # each individually means one queue put plus one main-thread append
+        # per token. Coalesce into one string per ~256 chars or 30 ms.
+        delta_buf = []
+        delta_len = 0
+        delta_since = 0.0
+
+        def flush_deltas():
+            nonlocal delta_len
+            if delta_buf:
+                self.message_queue.put("".join(delta_buf))
+                delta_buf.clear()
+                delta_len = 0
+
         try:
-            # Using the direct approach from your working example
-            async for message in self.ws:
-                if not self.running:
-                    break
-                
-                event = json.loads(message)
+            # recv(decode=False) yields the raw frame bytes, skipping the
+            # per-frame UTF-8 decode -- orjson parses bytes directly, so the
+            # str round trip was pure overhead. With binary audio frames
+            # enabled the frame type distinguishes audio from JSON, so keep
+            # the decoded path there.
+            use_raw = _WS_RAW_RECV and not AUDIO_BINARY_FRAMES
+            ws_recv = self.ws.recv
+            while self.running:
+                message = await (ws_recv(decode=False) if use_raw else ws_recv())
+
+                if not use_raw and isinstance(message, (bytes, bytearray)):
+                    # Binary frames carry raw audio deltas; nothing to parse
+                    # (this overlay runs with text modality only)
+                    continue
+
+                event = json_loads(message)
                 event_type = event.get("type")
                 
-                # Handle events directly instead of passing to another method
-                if event_type == "error":
-                    error_msg = f"Error event: {event['error']['message']}"
-                    self.message_queue.put(f"\n❌ {error_msg}\n")
-                
-                elif event_type == "response.text.delta":
+                if event_type == "response.text.delta":
                     text_delta = event["delta"]
                     
                     if not self.response_started:
                         self.message_queue.put("\n[OpenAI]: ")
                         self.response_started = True
+                        delta_since = time.monotonic()
                     
-                    # Send text through the message queue
-                    self.message_queue.put(text_delta)
+                    delta_buf.append(text_delta)
+                    delta_len += len(text_delta)
                     self.current_text_response += text_delta
-                
-                elif event_type == "response.done":
-                    self.message_queue.put("\n------------ End of response ------------\n")
-                    self.current_text_response = ''
-                    self.response_started = False
-                
-                elif event_type == "turn_detected.start":
-                    self.message_queue.put("\n🎤 Speech detected...\n")
-                
-                elif event_type == "turn_detected.end":
-                    self.message_queue.put("\n🔄 Processing your query...\n")
-                    # Create a new response after turn ended
-                    await self.ws.send(json.dumps({"type": "response.create"}))
+                    if delta_len >= 256 or time.monotonic() - delta_since >= 0.03:
+                        flush_deltas()
+                        delta_since = time.monotonic()
+                    continue
+
+                # Any non-delta event flushes first so ordering is preserved
+                flush_deltas()
+
+                # Everything else dispatches through the handler table: one
+                # dict lookup instead of walking an elif ladder per event
+                handler = self._handlers.get(event_type)
+                if handler:
+                    handler(event)
                 
         except websockets.ConnectionClosed as e:
             self.message_queue.put(f"\n⚠️ WebSocket connection closed: {e}\n")
         except Exception as e:
             self.message_queue.put(f"\n⚠️ Error in event processing: {str(e)}\n")
-            import traceback
-            self.message_queue.put(f"Details: {traceback.format_exc()}")
+            self.message_queue.put(format_error_details(e))
+        finally:
+            flush_deltas()
     
-    async def listen_audio(self):
-        """Capture audio from the selected input device to listen to meeting audio"""
+    def _on_error(self, event):
+        error_msg = f"Error event: {event['error']['message']}"
+        self.message_queue.put(f"\n❌ {error_msg}\n")
+
+    def _on_response_done(self, event):
+        self.message_queue.put("\n------------ End of response ------------\n")
+        self.current_text_response = ''
+        self.response_started = False
+
+    def _on_turn_start(self, event):
+        self.message_queue.put("\n🎤 Speech detected...\n")
+
+    def _on_turn_end(self, event):
+        self.message_queue.put("\n🔄 Processing your query...\n")
+        # Create a new response after turn ended
+        self._queue_frame(self._response_create)
+
+    def _queue_frame(self, frame):
+        """Hand a frame to the writer task, dropping the oldest on overflow."""
         try:
-            # First, try to identify BlackHole 16ch as our primary capture device
-            blackhole_index = None
-            
-            # Get all available audio devices
-            devices = []
-            info = pya.get_host_api_info_by_index(0)
-            num_devices = info.get('deviceCount')
+            self._tx.put_nowait(frame)
+        except asyncio.QueueFull:
+            try:
+                self._tx.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self._tx.put_nowait(frame)
+
+    async def _send_writer(self):
+        """Single writer coroutine: producers queue frames, only this task sends.
+
+        ws.send does not yield until the transport buffer fills, so draining a
+        burst back-to-back merges small frames into fewer syscalls and keeps
+        producers from ever blocking on the socket.
+        """
+        while True:
+            frame = await self._tx.get()
+            if frame is None:  # shutdown sentinel
+                break
+            await self.ws.send(frame)
+            while not self._tx.empty():
+                frame = self._tx.get_nowait()
+                if frame is None:
+                    return
+                await self.ws.send(frame)
+
+    def _check_capture_level(self, samples):
+        """Warn once if the capture device delivers sustained silence."""
+        if pcm_rms(samples) >= 10.0:
+            self._silent_chunks = 0
+            return
+        self._silent_chunks += 1
+        # ~23 chunks/s, so 10 s of dead silence usually means the Multi-Output
+        # Device is not actually routing system audio into BlackHole
+        if self._silent_chunks >= 230 and not self._silence_warned:
+            self._silence_warned = True
+            self.message_queue.put("\n⚠️ No audio detected for 10 seconds -- "
+                                   "check that your Multi-Output Device is set as the system output\n")
+
+    def _capture_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio callback: copy the incoming chunk into the ring buffer.
+
+        Runs on PortAudio's thread; must not block or allocate per call beyond
+        the zero-copy frombuffer view.
+        """
+        samples = np.frombuffer(in_data, dtype=np.int16, count=frame_count)
+        pos = self._ring_head % self._ring.size
+        end = pos + frame_count
+        if end <= self._ring.size:
+            self._ring[pos:end] = samples
+        else:
+            split = self._ring.size - pos
+            self._ring[pos:] = samples[:split]
+            self._ring[:end - self._ring.size] = samples[split:]
+        self._ring_head += frame_count
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._audio_event.set)
+        return (None, pyaudio.paContinue)
+
+    async def _pump_audio(self):
+        """Drain CHUNK_SIZE slices from the ring buffer and send them."""
+        while self.running:
+            try:
+                await asyncio.wait_for(self._audio_event.wait(), timeout=0.5)
+            except asyncio.TimeoutError:
+                continue  # periodic wake-up so self.running is noticed
+            self._audio_event.clear()
+            while self._ring_head - self._ring_tail >= CHUNK_SIZE:
+                backlog = self._ring_head - self._ring_tail
+                if backlog > _MAX_BACKLOG:
+                    # Over the latency budget: drop the oldest audio and
+                    # resume near live (flooring keeps the tail chunk-aligned)
+                    new_tail = (self._ring_head - _MAX_BACKLOG) // CHUNK_SIZE * CHUNK_SIZE
+                    self._dropped_frames += new_tail - self._ring_tail
+                    self._ring_tail = new_tail
+                    # Log drop totals at most once per second, not per drop
+                    now = time.monotonic()
+                    if now - self._last_drop_log >= 1.0:
+                        self._last_drop_log = now
+                        self.message_queue.put(
+                            f"\n⚠️ Audio falling behind -- dropped "
+                            f"{self._dropped_frames * 1000 // SAMPLE_RATE} ms total\n"
+                        )
+                pos = self._ring_tail % self._ring.size
+                # tail advances in CHUNK_SIZE steps and CHUNK_SIZE divides the
+                # ring size, so a chunk slice never wraps
+                chunk = self._ring[pos:pos + CHUNK_SIZE]
+                self._ring_tail += CHUNK_SIZE
+                self._check_capture_level(chunk)
+
+                # Only send when WebSocket is connected
+                if self.ws:
+                    if AUDIO_BINARY_FRAMES:
+                        # Raw binary frame: no base64, no JSON envelope
+                        self._queue_frame(chunk.tobytes())
+                    else:
+                        # b64encode reads the int16 slice via the buffer
+                        # protocol -- no intermediate bytes copy -- and the
+                        # precomputed envelope skips json.dumps entirely
+                        self._queue_frame(
+                            _APPEND_PREFIX
+                            + _b64encode(chunk).decode('ascii')
+                            + _APPEND_SUFFIX
+                        )
+
+    def _resolve_capture_device(self, pya):
+        """Find the BlackHole capture device, caching the result class-wide.
+
+        Returns the device index, or None when no BlackHole device exists.
+        The full enumeration (one Core Audio round-trip per device) and the
+        setup instructions are emitted only on the first discovery, so
+        reconnects during a flapping connection stay quiet and fast.
+        """
+        cls = type(self)
+        if cls._cached_capture_device is not None:
+            return cls._cached_capture_device[0]
+
+        # First, try to identify BlackHole 16ch as our primary capture device
+        blackhole_index = None
+        fallback_index = None
+        info = pya.get_host_api_info_by_index(0)
+        num_devices = info.get('deviceCount')
+        
+        device_lines = []
+        for i in range(0, num_devices):
+            device_info = pya.get_device_info_by_host_api_device_index(0, i)
+            device_name = device_info.get('name')
+            max_input = device_info.get('maxInputChannels')
+            max_output = device_info.get('maxOutputChannels')
+            device_lines.append(f"Device {i}: {device_name} (in:{max_input}, out:{max_output})")
             
-            # Log all devices for debugging
-            self.message_queue.put("\nAvailable audio devices:")
-            for i in range(0, num_devices):
-                device_info = pya.get_device_info_by_host_api_device_index(0, i)
-                device_name = device_info.get('name')
-                max_input = device_info.get('maxInputChannels')
-                max_output = device_info.get('maxOutputChannels')
-                device_desc = f"Device {i}: {device_name} (in:{max_input}, out:{max_output})"
-                self.message_queue.put(device_desc)
-                
-                # Store BlackHole 16ch index if found
-                if "BlackHole 16ch" in device_name and max_input > 0:
+            if max_input > 0:
+                # Prefer BlackHole 16ch; remember any other BlackHole device
+                if "BlackHole 16ch" in device_name:
                     blackhole_index = i
-                
-            # If BlackHole 16ch wasn't found, look for any BlackHole device
-            if blackhole_index is None:
-                for i in range(0, num_devices):
-                    device_info = pya.get_device_info_by_host_api_device_index(0, i)
-                    device_name = device_info.get('name')
-                    max_input = device_info.get('maxInputChannels')
-                    
-                    if "BlackHole" in device_name and max_input > 0:
-                        blackhole_index = i
-                        break
+                elif "BlackHole" in device_name and fallback_index is None:
+                    fallback_index = i
+        
+        if blackhole_index is None:
+            blackhole_index = fallback_index
+        
+        # One summary line instead of a put per device
+        self.message_queue.put("\nAvailable audio devices:\n" + "\n".join(device_lines) + "\n")
+        
+        if blackhole_index is not None:
+            device_name = pya.get_device_info_by_host_api_device_index(0, blackhole_index).get('name')
+            self.message_queue.put(f"\n✅ Using {device_name} to capture audio")
+            self.message_queue.put("\n⚠️ IMPORTANT SETUP INSTRUCTIONS:\n"
+                                   "1. Open System Settings > Sound\n"
+                                   "2. Create a Multi-Output Device with:\n"
+                                   "   - BlackHole 16ch\n"
+                                   "   - Your speakers/headphones\n"
+                                   "3. Set this Multi-Output Device as your system output\n"
+                                   "4. In Zoom/Chrome, use system sound settings\n")
+        else:
+            self.message_queue.put("\n⚠️ Could not find BlackHole audio device.\n"
+                                   "Please follow these steps:\n"
+                                   "1. Install BlackHole: brew install blackhole-16ch\n"
+                                   "2. Set up a Multi-Output Device in Audio MIDI Setup\n"
+                                   "3. Include both BlackHole and your speakers\n"
+                                   "4. Set this Multi-Output Device as your system output\n"
+                                   "5. Restart the application\n")
+        
+        cls._cached_capture_device = (blackhole_index, True)
+        return blackhole_index
+
+    async def listen_audio(self):
+        """Capture audio from the selected input device to listen to meeting audio"""
+        try:
+            self._loop = asyncio.get_running_loop()
+            self._audio_event = asyncio.Event()
+            self._ring_head = 0
+            self._ring_tail = 0
+            pya = get_pya()
+
+            # Resolve the capture device, scanning Core Audio only on the
+            # first session (or after a cached device failed to open)
+            blackhole_index = self._resolve_capture_device(pya)
             
             # If we found BlackHole, use it
             if blackhole_index is not None:
@@ -1135,55 +1698,27 @@ class OpenAIRealtimeLoop:
                 device_info = pya.get_device_info_by_host_api_device_index(0, selected_device_index)
                 device_name = device_info.get('name')
                 
-                self.message_queue.put(f"\n✅ Using {device_name} to capture audio")
-                self.message_queue.put("\n⚠️ IMPORTANT SETUP INSTRUCTIONS:")
-                self.message_queue.put("1. Open System Settings > Sound")
-                self.message_queue.put("2. Create a Multi-Output Device with:")
-                self.message_queue.put("   - BlackHole 16ch")
-                self.message_queue.put("   - Your speakers/headphones")
-                self.message_queue.put("3. Set this Multi-Output Device as your system output")
-                self.message_queue.put("4. In Zoom/Chrome, use system sound settings")
-                
-                # Open audio stream with BlackHole
-                self.audio_stream = pya.open(
-                    format=FORMAT,
-                    channels=CHANNELS,
-                    rate=SAMPLE_RATE,
-                    input=True,
-                    input_device_index=selected_device_index,
-                    frames_per_buffer=CHUNK_SIZE
-                )
+                # Open audio stream with BlackHole in callback mode: PortAudio
+                # delivers chunks on its own thread into the ring buffer
+                try:
+                    self.audio_stream = pya.open(
+                        format=FORMAT,
+                        channels=CHANNELS,
+                        rate=SAMPLE_RATE,
+                        input=True,
+                        input_device_index=selected_device_index,
+                        frames_per_buffer=CHUNK_SIZE,
+                        stream_callback=self._capture_callback
+                    )
+                except OSError:
+                    # Cached device is gone; rescan on the next session
+                    type(self)._cached_capture_device = None
+                    raise
                 
                 self.message_queue.put(f"🎤 Audio capture initialized with {device_name}")
                 
-                # Read audio data in a loop
-                while self.running:
-                    try:
-                        data = self.audio_stream.read(CHUNK_SIZE, exception_on_overflow=False)
-                        
-                        # Only send when WebSocket is connected
-                        if self.ws:
-                            base64_chunk = base64.b64encode(data).decode('utf-8')
-                            await self.ws.send(json.dumps({
-                                "type": "input_audio_buffer.append",
-                                "audio": base64_chunk
-                            }))
-                        
-                        await asyncio.sleep(0.01)
-                        
-                    except Exception as e:
-                        self.message_queue.put(f"Error reading audio: {str(e)}")
-                        await asyncio.sleep(0.5)
+                await self._pump_audio()
             else:
-                # Last resort: use default input device and explain
-                self.message_queue.put("\n⚠️ Could not find BlackHole audio device.")
-                self.message_queue.put("Please follow these steps:")
-                self.message_queue.put("1. Install BlackHole: brew install blackhole-16ch")
-                self.message_queue.put("2. Set up a Multi-Output Device in Audio MIDI Setup")
-                self.message_queue.put("3. Include both BlackHole and your speakers")
-                self.message_queue.put("4. Set this Multi-Output Device as your system output")
-                self.message_queue.put("5. Restart the application")
-                
                 # Try to use default input device as fallback
                 selected_device_index = pya.get_default_input_device_info()["index"]
                 device_info = pya.get_device_info_by_host_api_device_index(0, selected_device_index)
@@ -1192,39 +1727,22 @@ class OpenAIRealtimeLoop:
                 self.message_queue.put(f"\n⚠️ Falling back to default input: {device_name}")
                 self.message_queue.put("Note: This will only capture microphone input, not system audio")
                 
-                # Open audio stream with default device
+                # Open audio stream with default device in callback mode
                 self.audio_stream = pya.open(
                     format=FORMAT,
                     channels=CHANNELS,
                     rate=SAMPLE_RATE,
                     input=True,
                     input_device_index=selected_device_index,
-                    frames_per_buffer=CHUNK_SIZE
+                    frames_per_buffer=CHUNK_SIZE,
+                    stream_callback=self._capture_callback
                 )
                 
-                # Read audio data in a loop
-                while self.running:
-                    try:
-                        data = self.audio_stream.read(CHUNK_SIZE, exception_on_overflow=False)
-                        
-                        # Only send when WebSocket is connected
-                        if self.ws:
-                            base64_chunk = base64.b64encode(data).decode('utf-8')
-                            await self.ws.send(json.dumps({
-                                "type": "input_audio_buffer.append",
-                                "audio": base64_chunk
-                            }))
-                        
-                        await asyncio.sleep(0.01)
-                        
-                    except Exception as e:
-                        self.message_queue.put(f"Error reading audio: {str(e)}")
-                        await asyncio.sleep(0.5)
+                await self._pump_audio()
         
         except Exception as e:
             self.message_queue.put(f"⚠️ Error in audio capture: {str(e)}")
-            import traceback
-            self.message_queue.put(f"Details: {traceback.format_exc()}")
+            self.message_queue.put(format_error_details(e))
         finally:
             self.cleanup_audio()
     
@@ -1240,46 +1758,62 @@ class OpenAIRealtimeLoop:
             
             self.message_queue.put("🎙️ Listening for meeting audio...")
             
+            # All outbound frames flow through one writer task
+            self._tx = asyncio.Queue(maxsize=256)
+
             # Start audio and event handling as separate tasks
             async with asyncio.TaskGroup() as tg:
+                writer_task = tg.create_task(self._send_writer())
                 listen_task = tg.create_task(self.listen_audio())
                 receive_task = tg.create_task(self.receive_events())
                 stop_check_task = tg.create_task(self.check_stop_signal(delegate))
                 
                 # Wait for any task to complete
                 try:
-                    await asyncio.gather(listen_task, receive_task, stop_check_task)
+                    await asyncio.gather(writer_task, listen_task, receive_task, stop_check_task)
                 except asyncio.CancelledError:
                     self.message_queue.put("Tasks cancelled")
                     raise
         except Exception as e:
             self.message_queue.put(f"⚠️ Error in session: {str(e)}")
-            import traceback
-            self.message_queue.put(f"Details: {traceback.format_exc()}")
+            self.message_queue.put(format_error_details(e))
         finally:
             await self.cleanup_all()
     
     async def check_stop_signal(self, delegate):
+        # Block on the delegate's stop event in a worker thread so the asyncio
+        # loop can idle completely; the short timeout only exists so this task
+        # notices when the session dies for some other reason
         while self.running:
-            if not delegate.openai_running:
+            stopped = await asyncio.to_thread(delegate.stop_event.wait, 0.5)
+            if stopped or not delegate.openai_running:
                 self.running = False
+                if self._tx is not None:
+                    self._queue_frame(None)  # unblock the writer task
                 return
-            await asyncio.sleep(0.2)
     
     async def run(self, delegate):
+        # Exponential backoff with jitter between reconnects: a fixed 2-3 s
+        # retry hammers the endpoint through a persistent outage and wastes a
+        # TLS handshake per attempt. A session that survives 30 s resets the
+        # backoff to the floor.
+        backoff = 1.0
         while delegate.openai_running:
+            session_started = time.monotonic()
             try:
                 await self.start_session(delegate)
                 if not delegate.openai_running:
                     break
                 print("Session ended, reconnecting...")
-                await asyncio.sleep(2)
             except Exception as e:
                 print(f"Error in session: {str(e)}")
                 if not delegate.openai_running:
                     break
                 print("Reconnecting...")
-                await asyncio.sleep(3)
+            if time.monotonic() - session_started > 30:
+                backoff = 1.0
+            await asyncio.sleep(backoff + random.uniform(0, 0.5))
+            backoff = min(backoff * 2, 30)
 
     def cleanup_audio(self):
         if self.audio_stream:
@@ -1307,6 +1841,7 @@ class OpenAIRealtimeLoop:
     def list_audio_devices(self):
         """List all available audio input and output devices"""
         device_list = []
+        pya = get_pya()
         info = pya.get_host_api_info_by_index(0)
         num_devices = info.get('deviceCount')
         
@@ -1357,21 +1892,37 @@ def main():
     
     PyObjCTools.AppHelper.runEventLoop()
 
+# Shared HTTP session so later requests can reuse the TCP/TLS connection
+_http_session = None
+
+def get_http_session():
+    global _http_session
+    if _http_session is None:
+        import requests
+        _http_session = requests.Session()
+    return _http_session
+
 def test_openai_connection():
     """Test the connection to OpenAI to verify API key works."""
     try:
-        import requests
-        # Test basic API connectivity
-        response = requests.get(
+        # stream=True returns as soon as the headers arrive: the status code
+        # is all we need, so skip downloading the model list body, and a
+        # 3 s timeout keeps a dead network from stalling this thread
+        response = get_http_session().get(
             "https://api.openai.com/v1/models",
-            headers={"Authorization": f"Bearer {OPENAI_API_KEY}"}
+            headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
+            stream=True,
+            timeout=3
         )
-        if response.status_code == 200:
-            print("✅ OpenAI API connection test successful. API key is valid.")
-            return True
-        else:
-            print(f"❌ OpenAI API connection test failed: {response.status_code} - {response.text}")
-            return False
+        try:
+            if response.status_code == 200:
+                print("✅ OpenAI API connection test successful. API key is valid.")
+                return True
+            else:
+                print(f"❌ OpenAI API connection test failed: {response.status_code}")
+                return False
+        finally:
+            response.close()
     except Exception as e:
         print(f"❌ Error testing OpenAI API connection: {e}")
         return False